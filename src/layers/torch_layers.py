@@ -1,4 +1,3 @@
-import torch
 import torch.nn as nn
 from torch import Tensor
 from lif.lif_neuron_group import LIFNeuronGroup
@@ -15,21 +14,12 @@ class LIFLayer(nn.Module):
         Input shape: (timesteps, batch_size, num_neurons)
         Output: (timesteps, batch_size, num_neurons), voltages
         """
-        timesteps, batch_size, num_neurons = input_seq.shape
+        batch_size = input_seq.shape[1]
 
         # Resize internal buffers to match batch size
         self.lif_group.resize(batch_size)
 
-        spike_trace = torch.zeros_like(input_seq, dtype=torch.bool)
-        voltage_trace = torch.zeros_like(input_seq)
-
-        for t in range(timesteps):
-            ext_mod_t = external_modulation[t] if external_modulation is not None and external_modulation.ndim == 3 else external_modulation
-            spikes = self.lif_group(input_seq[t], ext_mod_t)
-            spike_trace[t] = spikes
-            voltage_trace[t] = self.lif_group.V
-
-        return spike_trace, voltage_trace
+        return self.lif_group.forward_sequence(input_seq, external_modulation)
 
     def reset(self):
         self.lif_group.reset()
\ No newline at end of file
@@ -0,0 +1,140 @@
+import numpy as np
+import torch
+
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+# splitmix64 constants, as uint64 globals so Numba keeps the hash in unsigned wrap-around arithmetic
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _rand(seed, counter):
+        """
+        Uniform sample in (0, 1) hashed from (seed, counter) with the splitmix64 finalizer.
+        Counter-based like Triton's tl.rand, so the result does not depend on how prange splits the neurons.
+        """
+        z = np.uint64(seed) + np.uint64(counter) * _GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        z = z ^ (z >> np.uint64(31))
+        return ((z >> np.uint64(11)) + 0.5) / 9007199254740992.0
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def lif_step_cpu(I, state, V_th, neuromod, spikes_out, spike_adapt, spike_trace, voltage_trace,
+                     seed, beta, eta, Vreset, noise_std, min_threshold, max_threshold, base_alpha, spike_adapt_decay,
+                     decay, spike_inc, dep_rate, rec_rate,
+                     stochastic, use_adaptive_threshold, allow_dynamic_spike_probability, store_trace):
+        """
+        One pass over the flattened neurons: runs all T rows of I (shape (T, n)) on every neuron and updates the
+        states in-place. neuromod has either T rows or a single row that is used for every step.
+        state is the (fields, n) state blob, see LIFNeuronGroup._pack_states for the field order.
+        Every random draw is hashed from seed and its (step, neuron, stream) counter.
+        """
+        V = state[0]
+        adapt = state[1]
+        syn = state[2]
+        thresh_adapt = state[4] if use_adaptive_threshold else state[0]
+        n_vth = V_th.shape[0]
+        n_steps = I.shape[0]
+        n = V.shape[0]
+        neuromod_per_step = neuromod.shape[0] == n_steps
+        for i in prange(n):
+            v = V[i]
+            for t in range(n_steps):
+                I_eff = I[t, i] * syn[i] + neuromod[t if neuromod_per_step else 0, i] - adapt[i]
+                v = beta * v + (1 - beta) * I_eff
+                counter = (t * n + i) * 3
+                if stochastic:
+                    # Box-Muller from two uniforms of this neuron and step
+                    u1 = _rand(seed, counter)
+                    u2 = _rand(seed, counter + 1)
+                    v += noise_std * np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+                if use_adaptive_threshold:
+                    threshold = min(max(V_th[i % n_vth] + thresh_adapt[i], min_threshold), max_threshold)
+                else:
+                    threshold = V_th[i % n_vth]
+
+                delta = v - threshold
+                if stochastic:
+                    if allow_dynamic_spike_probability:
+                        spike_adapt[i] = spike_adapt[i] * spike_adapt_decay + spikes_out[i]
+                        delta = base_alpha / (1.0 + spike_adapt[i]) * delta
+                    # u < sigmoid(delta) is equivalent to logit(u) < delta
+                    u = _rand(seed, counter + 2)
+                    spike = delta > np.log(u / (1.0 - u))
+                else:
+                    spike = delta >= 0
+
+                sp = 1.0 if spike else 0.0
+                if spike:
+                    v = Vreset
+                spikes_out[i] = 1 if spike else 0
+                adapt[i] = adapt[i] * decay + spike_inc * sp
+                syn[i] = syn[i] * (1 - dep_rate * sp) + rec_rate * (1 - syn[i])
+                if use_adaptive_threshold:
+                    thresh_adapt[i] = thresh_adapt[i] + eta * (sp - (1 - sp) * thresh_adapt[i])
+                if store_trace:
+                    spike_trace[t, i] = spikes_out[i]
+                    voltage_trace[t, i] = v
+            V[i] = v
+
+
+def _flat(t: torch.Tensor) -> np.ndarray:
+    # Zero-copy for contiguous CPU tensors, so writes to the array land in the tensor
+    return t.detach().reshape(-1).numpy()
+
+
+def _launch(I_seq, neuromod, spike_trace, voltage_trace, state, V_th, spikes, spike_adaptation, beta, eta, *,
+            V_reset, noise_std, stochastic,
+            use_adaptive_threshold, min_threshold, max_threshold, allow_dynamic_spike_probability, base_alpha,
+            spike_adapt_decay, adaptation_decay, spike_increase, depression_rate, recovery_rate,
+            sg_id=None, alpha=None):
+    # sg_id and alpha are unused, the forward pass of every surrogate is the same Heaviside step
+    n_elems = state[0].numel()
+    # Drawn from the torch CPU generator like the Triton seed, so torch.manual_seed keeps runs reproducible
+    seed = int(torch.randint(0, 2 ** 31 - 1, (1,)).item()) if stochastic else 0
+    state_rows = state.detach().reshape(state.shape[0], n_elems).numpy()
+    store_trace = spike_trace is not None
+    lif_step_cpu(
+        I_seq.detach().contiguous().reshape(-1, n_elems).numpy(), state_rows, _flat(V_th.contiguous()),
+        neuromod.detach().reshape(-1, n_elems).numpy(), _flat(spikes),
+        _flat(spike_adaptation) if allow_dynamic_spike_probability else state_rows[0],
+        spike_trace.reshape(-1, n_elems).numpy() if store_trace else _flat(spikes).reshape(1, -1),
+        voltage_trace.reshape(-1, n_elems).numpy() if store_trace else state_rows[:1],
+        seed, float(beta), float(eta), V_reset, noise_std, min_threshold, max_threshold, base_alpha, spike_adapt_decay,
+        adaptation_decay, spike_increase, depression_rate, recovery_rate,
+        stochastic, use_adaptive_threshold, allow_dynamic_spike_probability, store_trace
+    )
+
+
+def numba_lif_step(I, state, V_th, spikes, spike_adaptation, beta, eta, **constants):
+    """
+    Run one LIF step on the CPU with a single parallel Numba loop.
+    Takes the same arguments as the Triton step and updates the states in-place. No autograd graph is recorded.
+    Noise and spike sampling are seeded from the torch generator, but draw a different stream than the PyTorch step.
+    """
+    _launch(I, state[3], None, None, state, V_th, spikes, spike_adaptation, beta, eta, **constants)
+
+
+def numba_lif_sequence(I_seq, neuromod_seq, state, V_th, spikes, spike_adaptation, beta, eta, **constants):
+    """
+    Run all time steps of I_seq in one parallel Numba loop, with the time loop innermost per neuron.
+    Same arguments and return value as triton_lif_sequence.
+    """
+    neuromod = state[3] if neuromod_seq is None else neuromod_seq.expand(I_seq.shape).contiguous()
+    spike_trace = torch.empty(I_seq.shape, dtype=torch.uint8)
+    voltage_trace = torch.empty(I_seq.shape, dtype=state.dtype)
+    _launch(I_seq, neuromod, spike_trace, voltage_trace, state, V_th, spikes, spike_adaptation, beta, eta,
+            **constants)
+    return spike_trace, voltage_trace
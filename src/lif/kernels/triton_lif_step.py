@@ -0,0 +1,152 @@
+import torch
+
+try:
+    import triton
+    import triton.language as tl
+except ImportError:
+    triton = None
+
+TRITON_AVAILABLE = triton is not None
+
+BLOCK_SIZE = 1024
+
+
+if TRITON_AVAILABLE:
+    @triton.jit
+    def triton_lif_step_kernel(I_ptr, state_ptr, Vth_ptr, neuromod_ptr, spikes_ptr, spike_adapt_ptr,
+                               spike_trace_ptr, voltage_trace_ptr,
+                               seed, beta, eta, Vreset, noise_std, min_threshold, max_threshold,
+                               base_alpha, spike_adapt_decay, decay, spike_inc, dep_rate, rec_rate,
+                               T, N_elems, N_vth, neuromod_stride,
+                               STOCHASTIC: tl.constexpr,
+                               USE_ADAPTIVE_THRESHOLD: tl.constexpr,
+                               ALLOW_DYNAMIC_SPIKE_PROBABILITY: tl.constexpr,
+                               STORE_TRACE: tl.constexpr,
+                               BLOCK: tl.constexpr):
+        """
+        Loads all states of a block of neurons once, runs T LIF steps on them in registers and stores them back.
+        I is read as (T, N_elems); with STORE_TRACE the spikes and voltages of every step are written out as well.
+        state_ptr points to the (fields, N_elems) state blob, see LIFNeuronGroup._pack_states for the field order.
+        """
+        offs = tl.program_id(0) * BLOCK + tl.arange(0, BLOCK)
+        mask = offs < N_elems
+        V_ptr = state_ptr
+        adapt_ptr = state_ptr + N_elems
+        syn_ptr = state_ptr + 2 * N_elems
+        thresh_adapt_ptr = state_ptr + 4 * N_elems
+
+        V = tl.load(V_ptr + offs, mask=mask).to(tl.float32)
+        V_th = tl.load(Vth_ptr + offs % N_vth, mask=mask).to(tl.float32)
+        adapt = tl.load(adapt_ptr + offs, mask=mask).to(tl.float32)
+        syn = tl.load(syn_ptr + offs, mask=mask).to(tl.float32)
+        sp = tl.load(spikes_ptr + offs, mask=mask).to(tl.float32)
+        if USE_ADAPTIVE_THRESHOLD:
+            thresh_adapt = tl.load(thresh_adapt_ptr + offs, mask=mask).to(tl.float32)
+        else:
+            thresh_adapt = tl.zeros([BLOCK], dtype=tl.float32)
+        if ALLOW_DYNAMIC_SPIKE_PROBABILITY:
+            spike_adapt = tl.load(spike_adapt_ptr + offs, mask=mask).to(tl.float32)
+        else:
+            spike_adapt = tl.zeros([BLOCK], dtype=tl.float32)
+
+        for t in range(T):
+            I = tl.load(I_ptr + t * N_elems + offs, mask=mask).to(tl.float32)
+            neuromod = tl.load(neuromod_ptr + t * neuromod_stride + offs, mask=mask).to(tl.float32)
+
+            I_eff = I * syn + neuromod - adapt
+            V = beta * V + (1 - beta) * I_eff
+            if STOCHASTIC:
+                V = V + tl.randn(seed + t, offs) * noise_std
+
+            if USE_ADAPTIVE_THRESHOLD:
+                threshold = tl.minimum(tl.maximum(V_th + thresh_adapt, min_threshold), max_threshold)
+            else:
+                threshold = V_th
+
+            delta = V - threshold
+            if STOCHASTIC:
+                if ALLOW_DYNAMIC_SPIKE_PROBABILITY:
+                    spike_adapt = spike_adapt * spike_adapt_decay + sp
+                    delta = base_alpha / (1.0 + spike_adapt) * delta
+                # Offset the uniform stream so it does not reuse the Philox counters of the membrane noise
+                u = tl.rand(seed + t, offs + N_elems)
+                # u < sigmoid(delta) is equivalent to logit(u) < delta
+                spikes = delta > tl.log(u / (1 - u))
+            else:
+                spikes = delta >= 0
+
+            V = tl.where(spikes, Vreset, V)
+            sp = spikes.to(tl.float32)
+            adapt = adapt * decay + spike_inc * sp
+            syn = syn * (1 - dep_rate * sp) + rec_rate * (1 - syn)
+            if USE_ADAPTIVE_THRESHOLD:
+                thresh_adapt = thresh_adapt + eta * (sp - (1 - sp) * thresh_adapt)
+
+            if STORE_TRACE:
+                tl.store(spike_trace_ptr + t * N_elems + offs, sp.to(tl.uint8), mask=mask)
+                tl.store(voltage_trace_ptr + t * N_elems + offs, V, mask=mask)
+
+        tl.store(V_ptr + offs, V, mask=mask)
+        tl.store(spikes_ptr + offs, sp.to(tl.uint8), mask=mask)
+        tl.store(adapt_ptr + offs, adapt, mask=mask)
+        tl.store(syn_ptr + offs, syn, mask=mask)
+        if USE_ADAPTIVE_THRESHOLD:
+            tl.store(thresh_adapt_ptr + offs, thresh_adapt, mask=mask)
+        if ALLOW_DYNAMIC_SPIKE_PROBABILITY:
+            tl.store(spike_adapt_ptr + offs, spike_adapt, mask=mask)
+
+
+def _launch(I_seq, neuromod, neuromod_stride, spike_trace, voltage_trace, state, V_th, spikes, spike_adaptation,
+            beta, eta, *, V_reset, noise_std,
+            stochastic, use_adaptive_threshold, min_threshold, max_threshold, allow_dynamic_spike_probability,
+            base_alpha, spike_adapt_decay, adaptation_decay, spike_increase, depression_rate, recovery_rate,
+            sg_id=None, alpha=None):
+    # sg_id and alpha are unused, the forward pass of every surrogate is the same Heaviside step
+    n_elems = state[0].numel()
+    store_trace = spike_trace is not None
+    # Drawn from the torch CPU generator, so torch.manual_seed keeps runs reproducible without a device sync
+    seed = int(torch.randint(0, 2 ** 31 - 1, (1,)).item()) if stochastic else 0
+    grid = (triton.cdiv(n_elems, BLOCK_SIZE),)
+    triton_lif_step_kernel[grid](
+        I_seq.contiguous(), state, V_th.contiguous(), neuromod, spikes,
+        spike_adaptation if allow_dynamic_spike_probability else state,
+        spike_trace if store_trace else spikes,
+        voltage_trace if store_trace else state,
+        seed, float(beta), float(eta), V_reset, noise_std, min_threshold, max_threshold,
+        base_alpha, spike_adapt_decay, adaptation_decay, spike_increase, depression_rate, recovery_rate,
+        I_seq.numel() // n_elems, n_elems, V_th.numel(), neuromod_stride,
+        STOCHASTIC=stochastic,
+        USE_ADAPTIVE_THRESHOLD=use_adaptive_threshold,
+        ALLOW_DYNAMIC_SPIKE_PROBABILITY=allow_dynamic_spike_probability,
+        STORE_TRACE=store_trace,
+        BLOCK=BLOCK_SIZE
+    )
+
+
+def triton_lif_step(I, state, V_th, spikes, spike_adaptation, beta, eta, **constants):
+    """
+    Run one LIF step on CUDA with a single fused Triton kernel.
+    Updates the (fields, batch_size, num_neurons) state blob, spikes and spike_adaptation in-place.
+    No autograd graph is recorded.
+    """
+    _launch(I, state[3], 0, None, None, state, V_th, spikes, spike_adaptation, beta, eta, **constants)
+
+
+def triton_lif_sequence(I_seq, neuromod_seq, state, V_th, spikes, spike_adaptation, beta, eta, **constants):
+    """
+    Run all time steps of I_seq with a single Triton kernel launch, keeping the states in registers in between.
+
+    :param I_seq: Input currents of shape (timesteps, batch_size, num_neurons).
+    :param neuromod_seq: Per-step neuromodulator of shape (timesteps, ...), or None to use the neuromodulator
+        of the state blob for every step.
+    :return: Tuple of (spikes as uint8, voltages), both of shape (timesteps, batch_size, num_neurons).
+    """
+    if neuromod_seq is None:
+        neuromod, neuromod_stride = state[3], 0
+    else:
+        neuromod, neuromod_stride = neuromod_seq.expand(I_seq.shape).contiguous(), state[0].numel()
+    spike_trace = torch.empty(I_seq.shape, dtype=torch.uint8, device=state.device)
+    voltage_trace = torch.empty(I_seq.shape, dtype=state.dtype, device=state.device)
+    _launch(I_seq, neuromod, neuromod_stride, spike_trace, voltage_trace, state, V_th, spikes, spike_adaptation,
+            beta, eta, **constants)
+    return spike_trace, voltage_trace
@@ -1,22 +1,169 @@
+import functools
+import math
+
 import numpy as np
 import torch
 import torch.nn as nn
 
-from lif.sg.spike_function import SpikeFunction
+from lif.sg.spike_function import apply_surrogate, surrogate_id
 from lif.probability.dynamic_spike_probability import DynamicSpikeProbability
+from lif.kernels.lif_step_numba import NUMBA_AVAILABLE, numba_lif_sequence, numba_lif_step
+from lif.kernels.triton_lif_step import TRITON_AVAILABLE, triton_lif_sequence, triton_lif_step
+
+# Order of the floating point states in the state blob, the fused kernels address them by this index
+_STATE_FIELDS = ("V", "adaptation_current", "synaptic_efficiency", "neuromodulator", "threshold_adaptation")
 
 
 def get_surrogate_fn(name, alpha):
-    if name == "heaviside":
-        return lambda x: SpikeFunction.apply(x, "heaviside", alpha)
-    elif name == "fast_sigmoid":
-        return lambda x: SpikeFunction.apply(x, "fast_sigmoid", alpha)
-    elif name == "gaussian":
-        return lambda x: SpikeFunction.apply(x, "gaussian", alpha)
-    elif name == "arctan":
-        return lambda x: SpikeFunction.apply(x, "arctan", alpha)
+    """
+    Spike function with the named surrogate gradient, as a callable of the distance to the threshold.
+    Kept for existing callers, the neuron group itself dispatches by id through apply_surrogate.
+    """
+    sg_id = surrogate_id(name)
+    return lambda x: apply_surrogate(x, sg_id, alpha)
+
+
+def _make_lif_step(*, V_reset, noise_std, stochastic, use_adaptive_threshold, min_threshold, max_threshold,
+                   allow_dynamic_spike_probability, base_alpha, spike_adapt_decay, adaptation_decay, spike_increase,
+                   depression_rate, recovery_rate, sg_id, alpha, inplace=False):
+    """
+    Build the step function for one fixed configuration of the neuron group.
+    Every configuration flag is resolved here, once, by picking the matching stage functions.
+    The returned step is straight-line tensor code with the scalars baked in as constants,
+    so neither the eager path nor a torch.compile graph checks a flag per step.
+    With inplace the membrane potential is updated in the passed V, which is only valid while no autograd graph
+    is recorded (torch.no_grad()); the group never selects it with grad enabled.
+    """
+    if inplace:
+        def integrate(V, I_eff, beta):
+            # The same ops in the same order as the out-of-place update, so both give bitwise equal results,
+            # but written into V and the fresh I_eff instead of temporaries
+            return V.mul_(beta).add_(I_eff.mul_(1 - beta))
     else:
-        raise ValueError(f"Unknown surrogate gradient function: {name}")
+        def integrate(V, I_eff, beta):
+            return V * beta + I_eff * (1 - beta)
+
+    if stochastic and inplace:
+        def add_noise(V, noise):
+            return V.add_(noise.normal_(0.0, noise_std))
+    elif stochastic:
+        def add_noise(V, noise):
+            return V + noise.normal_(0.0, noise_std)
+    else:
+        def add_noise(V, noise):
+            return V
+
+    if use_adaptive_threshold:
+        def get_threshold(V_th, threshold_adaptation):
+            return torch.clamp(V_th + threshold_adaptation, min_threshold, max_threshold)
+
+        def adapt_threshold(threshold_adaptation, sp, eta):
+            # Branchless form of "raise by eta on a spike, otherwise decay towards the base threshold"
+            return threshold_adaptation + eta * (sp - (1 - sp) * threshold_adaptation)
+    else:
+        def get_threshold(V_th, threshold_adaptation):
+            return V_th
+
+        def adapt_threshold(threshold_adaptation, sp, eta):
+            return threshold_adaptation
+
+    # u < sigmoid(delta) is equivalent to logit(u) < delta, so in stochastic mode the logistic noise is put on the
+    # threshold instead of computing the spike probability
+    if not stochastic:
+        def fire(V, threshold, spikes, spike_adaptation, uniform):
+            return apply_surrogate(V - threshold, sg_id, alpha).bool(), spike_adaptation
+    elif allow_dynamic_spike_probability:
+        def fire(V, threshold, spikes, spike_adaptation, uniform):
+            spike_adaptation = spike_adaptation * spike_adapt_decay + spikes.to(spike_adaptation.dtype)
+            delta = base_alpha / (1.0 + spike_adaptation) * (V - threshold)
+            return delta > uniform.uniform_().logit_(1e-7), spike_adaptation
+    else:
+        def fire(V, threshold, spikes, spike_adaptation, uniform):
+            return V - threshold > uniform.uniform_().logit_(1e-7), spike_adaptation
+
+    def lif_step(I, V, V_th, spikes, adaptation_current, synaptic_efficiency, neuromodulator, spike_adaptation,
+                 threshold_adaptation, noise, uniform, beta, eta):
+        """
+        Pure tensor update for one time step of the LIF neuron group.
+        Takes and returns tensors only, so the whole step can be traced and fused by torch.compile.
+        The only arguments written in-place are the ``noise`` and ``uniform`` scratch buffers, and V with inplace.
+
+        Spikes are passed in and returned as uint8 tensors.
+
+        :return: Tuple of (V, spikes, adaptation_current, synaptic_efficiency, spike_adaptation,
+            threshold_adaptation).
+        """
+        I_eff = I * synaptic_efficiency + neuromodulator - adaptation_current
+        # Exact discretization of the leaky integrator, beta = exp(-dt / tau)
+        V = add_noise(integrate(V, I_eff, beta), noise)
+
+        threshold = get_threshold(V_th.to(V.dtype), threshold_adaptation)
+        spikes, spike_adaptation = fire(V, threshold, spikes, spike_adaptation, uniform)
+
+        # V is a fresh intermediate here (or the state itself without autograd) and none of the ops above saved it
+        # for backward, so the reset can be in-place
+        V.masked_fill_(spikes, V_reset)
+
+        sp = spikes.to(V.dtype)
+        adaptation_current = adaptation_current * adaptation_decay + spike_increase * sp
+        synaptic_efficiency = (
+                synaptic_efficiency * (1 - depression_rate * sp) +
+                recovery_rate * (1 - synaptic_efficiency)
+        )
+        threshold_adaptation = adapt_threshold(threshold_adaptation, sp, eta)
+        return (V, spikes.view(torch.uint8), adaptation_current, synaptic_efficiency,
+                spike_adaptation, threshold_adaptation)
+
+    return lif_step
+
+
+def _lif_sequence(I_seq, neuromod_seq, V, V_th, spikes, adaptation_current, synaptic_efficiency, neuromodulator,
+                  spike_adaptation, threshold_adaptation, noise, uniform, beta, eta, *, step_fn):
+    """
+    Run step_fn over all time steps of I_seq, so torch.compile can unroll the whole sequence into one graph.
+
+    :param neuromod_seq: Per-step neuromodulator of shape (timesteps, ...), or None to use ``neuromodulator``
+        for every step.
+    :return: Tuple of (spikes, voltages) of shape (timesteps, batch_size, num_neurons),
+        followed by the final states as returned by step_fn.
+    """
+    spike_seq = []
+    voltage_seq = []
+    for t in range(I_seq.shape[0]):
+        if neuromod_seq is not None:
+            neuromodulator = neuromod_seq[t]
+        V, spikes, adaptation_current, synaptic_efficiency, spike_adaptation, threshold_adaptation = step_fn(
+            I_seq[t], V, V_th, spikes, adaptation_current, synaptic_efficiency, neuromodulator, spike_adaptation,
+            threshold_adaptation, noise, uniform, beta, eta
+        )
+        spike_seq.append(spikes)
+        voltage_seq.append(V)
+    return (torch.stack(spike_seq), torch.stack(voltage_seq),
+            V, spikes, adaptation_current, synaptic_efficiency, spike_adaptation, threshold_adaptation)
+
+
+def pack_spikes(spikes: torch.Tensor) -> torch.Tensor:
+    """
+    Pack a (..., num_neurons) spike tensor into bits, eight neurons per byte.
+
+    :param spikes: Boolean or uint8 spike tensor.
+    :return: uint8 tensor of shape (..., ceil(num_neurons / 8)), neuron i is stored in bit i % 8 of byte i // 8.
+    """
+    bits = nn.functional.pad(spikes.to(torch.uint8), (0, -spikes.shape[-1] % 8))
+    bits = bits.unflatten(-1, (-1, 8)) << torch.arange(8, dtype=torch.uint8, device=spikes.device)
+    return bits.sum(-1, dtype=torch.uint8)
+
+
+def unpack_spikes(packed: torch.Tensor, num_neurons: int) -> torch.Tensor:
+    """
+    Inverse of pack_spikes.
+
+    :param packed: uint8 tensor of shape (..., ceil(num_neurons / 8)).
+    :param num_neurons: Number of neurons that were packed.
+    :return: Boolean spike tensor of shape (..., num_neurons).
+    """
+    masks = torch.tensor([1, 2, 4, 8, 16, 32, 64, 128], dtype=torch.uint8, device=packed.device)
+    return torch.bitwise_and(packed.unsqueeze(-1), masks).ne(0).flatten(-2)[..., :num_neurons]
 
 
 class LIFNeuronGroup(nn.Module):
@@ -51,7 +198,9 @@ class LIFNeuronGroup(nn.Module):
                  neuromod_transform=None,
                  learnable_threshold: bool = True,
                  learnable_tau: bool = False,
-                 learnable_eta: bool = False):
+                 learnable_eta: bool = False,
+                 compile_step: bool = False,
+                 dtype: torch.dtype = torch.float32):
         """
         Initialize the LIF neuron group with its parameters.
 
@@ -82,6 +231,9 @@ class LIFNeuronGroup(nn.Module):
         :param learnable_threshold: Whether the threshold voltage should be learnable.
         :param learnable_tau: Whether the membrane time constant should be learnable.
         :param learnable_eta: Whether the adaptation rate should be learnable.
+        :param compile_step: Whether to fuse the per-step update into a single kernel with torch.compile.
+        :param dtype: Floating point type of the neuron states. Half precision halves the memory traffic of the step,
+            while the (learnable) threshold is kept in float32 and cast on use.
         """
         assert num_neurons > 0, "Number of neurons must be positive."
 
@@ -101,19 +253,29 @@ class LIFNeuronGroup(nn.Module):
         assert spike_increase >= 0, "spike_increase must be non-negative."
         assert 0 <= depression_rate <= 1, "depression_rate must be in [0, 1]."
         assert recovery_rate >= 0, "recovery_rate must be non-negative."
+        assert dtype in [torch.float32, torch.float16, torch.bfloat16], \
+            "dtype must be one of torch.float32, torch.float16, torch.bfloat16."
 
         super(LIFNeuronGroup, self).__init__()
         self.device = torch.device(device)
         self.num_neurons = num_neurons
+        self.dtype = dtype
 
         shape = (1, num_neurons)
-        self.V_th = nn.Parameter(torch.full(shape, V_th)) if learnable_threshold else torch.full(shape, V_th)
-        self.tau = nn.Parameter(torch.tensor(tau)) if learnable_tau else torch.tensor(tau)
-        self.eta = nn.Parameter(torch.tensor(eta)) if learnable_eta else torch.tensor(eta)
+        # One threshold per neuron, broadcast over the batch, so it never has to follow the batch size
+        if learnable_threshold:
+            self.V_th = nn.Parameter(torch.full((num_neurons,), V_th))
+        else:
+            self.register_buffer("V_th", torch.full((num_neurons,), V_th))
+        # Constants stay Python floats, so they hit the scalar overloads instead of launching tensor-scalar kernels
+        self.tau = nn.Parameter(torch.tensor(tau)) if learnable_tau else float(tau)
+        self.eta = nn.Parameter(torch.tensor(eta)) if learnable_eta else float(eta)
 
-        self.V_reset = V_reset
-        self.dt = dt
-        self.noise_std = noise_std
+        self.V_reset = float(V_reset)
+        self.dt = float(dt)
+        # Decay factor of the membrane potential, recomputed per forward pass only if tau is learnable
+        self.beta = None if learnable_tau else math.exp(-dt / tau)
+        self.noise_std = float(noise_std)
         self.stochastic = stochastic
         self.use_adaptive_threshold = use_adaptive_threshold
         self.min_threshold = min_threshold
@@ -132,25 +294,76 @@ class LIFNeuronGroup(nn.Module):
         ) if allow_dynamic_spike_probability else None
 
         self.neuromod_transform = neuromod_transform
-        self.surrogate_fn = get_surrogate_fn(surrogate_gradient_function, alpha)
+        self._sg_id = surrogate_id(surrogate_gradient_function)
+
+        # Scalars are bound as Python floats, so torch.compile bakes them into the fused kernel as constants
+        self._step_constants = dict(
+            V_reset=float(V_reset),
+            noise_std=float(noise_std),
+            stochastic=stochastic,
+            use_adaptive_threshold=use_adaptive_threshold,
+            min_threshold=float(min_threshold),
+            max_threshold=float(max_threshold),
+            allow_dynamic_spike_probability=allow_dynamic_spike_probability,
+            base_alpha=float(base_alpha),
+            spike_adapt_decay=math.exp(-1.0 / tau_adapt),
+            adaptation_decay=float(adaptation_decay),
+            spike_increase=float(spike_increase),
+            depression_rate=float(depression_rate),
+            recovery_rate=float(recovery_rate),
+            sg_id=self._sg_id,
+            alpha=float(alpha)
+        )
+        self._step_fn = _make_lif_step(**self._step_constants)
+        # The sequence keeps the out-of-place step, every step's V is stacked into the returned voltages
+        self._sequence_fn = functools.partial(_lif_sequence, step_fn=self._step_fn)
+        self._inplace_step_fn = _make_lif_step(**self._step_constants, inplace=True)
+        self.compile_step = compile_step
+        self._compiled_steps = {}
 
-        self.register_buffer("V", torch.zeros(shape))
-        self.register_buffer("spikes", torch.zeros(shape, dtype=torch.bool))
-        self.register_buffer("adaptation_current", torch.zeros(shape))
-        self.register_buffer("synaptic_efficiency", torch.ones(shape))
-        self.register_buffer("neuromodulator", torch.ones(shape))
+        # The floating point states are views into one (fields, batch_size, num_neurons) blob, so the fused kernels
+        # get them as a single contiguous allocation. The views are what gets saved, the blob itself is not.
+        self._state_fields = _STATE_FIELDS if use_adaptive_threshold else _STATE_FIELDS[:4]
+        self.register_buffer("_state", self._new_state(shape), persistent=False)
+        for i, name in enumerate(self._state_fields):
+            self.register_buffer(name, self._state[i])
+        if not use_adaptive_threshold:
+            self.register_buffer("threshold_adaptation", None)
+        self.register_buffer("spikes", torch.zeros(shape, dtype=torch.uint8))
+        self.register_buffer("_noise", torch.empty(shape, dtype=dtype) if stochastic else None, persistent=False)
+        # Kept in float32 regardless of dtype, half precision is too coarse to resolve small spike probabilities
+        self.register_buffer("_uniform", torch.empty(shape) if stochastic else None, persistent=False)
+
+    @property
+    def spikes_packed(self) -> torch.Tensor:
+        """
+        Spikes of the last step packed into bits, for cheap transport between layers. See unpack_spikes.
+        """
+        return pack_spikes(self.spikes)
+
+    @property
+    def threshold(self) -> torch.Tensor:
+        """
+        Effective firing threshold of shape (batch_size, num_neurons): the base V_th plus the adaptive offset
+        in threshold_adaptation, clamped to [min_threshold, max_threshold] like in the step.
+        """
+        if self.threshold_adaptation is None:
+            return self.V_th.to(self.dtype).expand(self.V.shape)
+        return torch.clamp(self.V_th.to(self.dtype) + self.threshold_adaptation, self.min_threshold, self.max_threshold)
 
     def resize(self, batch_size):
+        if self.V.shape[0] == batch_size:
+            # Same shape, so recycle the existing buffers instead of allocating new ones
+            self.reset()
+            return
+
         shape = (batch_size, self.num_neurons)
-        self.V = torch.zeros(shape, device=self.device)
-        self.spikes = torch.zeros(shape, dtype=torch.bool, device=self.device)
-        self.adaptation_current = torch.zeros(shape, device=self.device)
-        self.synaptic_efficiency = torch.ones(shape, device=self.device)
-        self.neuromodulator = torch.ones(shape, device=self.device)
-        if isinstance(self.V_th, nn.Parameter):
-            self.V_th = nn.Parameter(torch.full(shape, self.V_th.data.mean(), device=self.device))
-        else:
-            self.V_th = torch.full(shape, self.V_th.mean(), device=self.device)
+        self._state = self._new_state(shape, self.device)
+        self._bind_states()
+        self.spikes = torch.zeros(shape, dtype=torch.uint8, device=self.device)
+        if self._noise is not None:
+            self._noise = torch.empty(shape, dtype=self.dtype, device=self.device)
+            self._uniform = torch.empty(shape, device=self.device)
         if self.dynamic_spike_probability:
             self.dynamic_spike_probability.reset(batch_size)
 
@@ -159,22 +372,101 @@ class LIFNeuronGroup(nn.Module):
         Initialize or reset internal states for a given batch size.
         """
         self.batch_size = batch_size
-
-        self.V = torch.zeros((batch_size, self.num_neurons), device=self.device)
-        self.spikes = torch.zeros((batch_size, self.num_neurons), dtype=torch.bool, device=self.device)
-        self.adaptation_current = torch.zeros((batch_size, self.num_neurons), device=self.device)
-        self.synaptic_efficiency = torch.ones((batch_size, self.num_neurons), device=self.device)
-        self.neuromodulator = torch.ones((batch_size, self.num_neurons), device=self.device)
+        self.resize(batch_size)
 
     def reset(self):
-        self.V.zero_()
+        # detach() first, states left over from training still carry autograd history that must not be extended
+        self.V = self.V.detach().zero_()
         self.spikes.zero_()
-        self.adaptation_current.zero_()
-        self.synaptic_efficiency.fill_(1.0)
-        self.neuromodulator.fill_(1.0)
+        self.adaptation_current = self.adaptation_current.detach().zero_()
+        self.synaptic_efficiency = self.synaptic_efficiency.detach().fill_(1.0)
+        self.neuromodulator = self.neuromodulator.detach().fill_(1.0)
+        if self.threshold_adaptation is not None:
+            self.threshold_adaptation = self.threshold_adaptation.detach().zero_()
         if self.dynamic_spike_probability:
             self.dynamic_spike_probability.reset(self.V.shape[0])
 
+    def _new_state(self, shape, device=None) -> torch.Tensor:
+        """
+        Allocate a state blob of shape (fields, *shape) holding the initial states, in _STATE_FIELDS order.
+        """
+        state = torch.zeros((len(self._state_fields), *shape), dtype=self.dtype, device=device)
+        # synaptic_efficiency and neuromodulator start at 1
+        state[2:4].fill_(1.0)
+        return state
+
+    def _bind_states(self):
+        for i, name in enumerate(self._state_fields):
+            setattr(self, name, self._state[i])
+
+    def _pack_states(self) -> torch.Tensor:
+        """
+        Return the state blob for the fused kernels, with every state attribute a view into it.
+        The PyTorch step rebinds the states to new tensors, those are copied back into the blob once here.
+        While the fused kernels run back to back the attributes stay views and nothing is copied.
+        """
+        shape = self.V.shape
+        if self._state.shape[1:] != shape or self._state.device != self.V.device:
+            self._state = self._new_state(shape, self.V.device)
+        for i, name in enumerate(self._state_fields):
+            value = getattr(self, name)
+            row = self._state[i]
+            # Also catches a broadcast neuromodulator set from an external modulation signal
+            if value.data_ptr() != row.data_ptr() or value.shape != row.shape:
+                row.copy_(value.detach())
+                setattr(self, name, row)
+        return self._state
+
+    def _get_step_fn(self, I: torch.Tensor, sequence: bool = False):
+        """
+        Return the (sequence) step function for the given input, compiling it once per (device, dtype, shape).
+        Under torch.no_grad() the single step updates V in-place. With grad enabled (also in eval mode) the
+        out-of-place step is used, so V never picks up autograd history through a view of the state blob.
+        """
+        inplace = not sequence and not torch.is_grad_enabled()
+        if sequence:
+            step_fn = self._sequence_fn
+        else:
+            step_fn = self._inplace_step_fn if inplace else self._step_fn
+        if not self.compile_step:
+            return step_fn
+        key = (sequence, inplace, I.device, I.dtype, tuple(I.shape))
+        compiled_fn = self._compiled_steps.get(key)
+        if compiled_fn is None:
+            # The default mode is used on purpose: CUDA graphs ("reduce-overhead") would recycle the output
+            # buffers that are fed back in as state on the next step.
+            compiled_fn = torch.compile(step_fn, fullgraph=True)
+            self._compiled_steps[key] = compiled_fn
+        return compiled_fn
+
+    def _get_beta(self):
+        """
+        Return the membrane decay factor exp(-dt / tau), as a Python float unless tau is learnable.
+        """
+        return self.beta if self.beta is not None else torch.exp(-self.dt / self.tau)
+
+    def _get_fused_kernel(self, I: torch.Tensor, sequence: bool = False):
+        """
+        Return the hand-written (sequence) kernel for the given input, or None if the PyTorch step has to be used.
+        These kernels update the states in-place and record no autograd graph, so they are only used for inference.
+        """
+        if self.training and torch.is_grad_enabled():
+            return None
+        if self.allow_dynamic_spike_probability and self.dynamic_spike_probability.adaptation.shape != self.V.shape:
+            # The kernels index spike_adaptation per state element, they cannot broadcast it like the PyTorch step
+            return None
+        if TRITON_AVAILABLE and I.is_cuda:
+            return triton_lif_sequence if sequence else triton_lif_step
+        if NUMBA_AVAILABLE and I.device.type == "cpu" and I.dtype == torch.float32:
+            return numba_lif_sequence if sequence else numba_lif_step
+        return None
+
+    def _transform_modulation(self, external_modulation: torch.Tensor) -> torch.Tensor:
+        return (
+            self.neuromod_transform(external_modulation)
+            if self.neuromod_transform else torch.sigmoid(external_modulation)
+        ).to(self.dtype)
+
     def forward(self, I: torch.Tensor, external_modulation: torch.Tensor = None) -> torch.Tensor:
         """
         Simulate one time step for all neurons in the group.
@@ -189,38 +481,74 @@ class LIFNeuronGroup(nn.Module):
             self.resize(I.shape[0])
 
         if external_modulation is not None:
-            self.neuromodulator = (
-                self.neuromod_transform(external_modulation)
-                if self.neuromod_transform else torch.sigmoid(external_modulation)
-            )
+            self.neuromodulator = self._transform_modulation(external_modulation)
 
-        noise = torch.randn_like(I) * self.noise_std if self.stochastic else 0.0
+        spike_adaptation = self.dynamic_spike_probability.adaptation if self.allow_dynamic_spike_probability else None
+        I = I.to(self.dtype)
+        beta = self._get_beta()
+        fused_kernel = self._get_fused_kernel(I)
+        if fused_kernel is not None:
+            fused_kernel(
+                I, self._pack_states(), self.V_th, self.spikes, spike_adaptation, beta, self.eta,
+                **self._step_constants
+            )
+            # The kernels write into self.spikes in-place, so hand out a copy that the next step does not overwrite
+            return self.spikes.view(torch.bool).clone()
 
-        I_eff = I * self.synaptic_efficiency + self.neuromodulator - self.adaptation_current
-        dV = (I_eff - self.V) / self.tau
-        self.V = self.V + dV * self.dt + noise
+        step_fn = self._get_step_fn(I)
+        (self.V, self.spikes, self.adaptation_current, self.synaptic_efficiency,
+         spike_adaptation, self.threshold_adaptation) = step_fn(
+            I, self.V, self.V_th, self.spikes, self.adaptation_current, self.synaptic_efficiency,
+            self.neuromodulator, spike_adaptation, self.threshold_adaptation, self._noise, self._uniform,
+            beta, self.eta
+        )
+        if self.allow_dynamic_spike_probability:
+            self.dynamic_spike_probability.adaptation = spike_adaptation
 
-        if self.stochastic:
-            delta = self.V - self.V_th
-            spike_prob, _ = self.dynamic_spike_probability(delta, self.spikes) \
-                if self.allow_dynamic_spike_probability else torch.sigmoid(delta)
-            self.spikes = torch.rand_like(self.V) < spike_prob
-        else:
-            spike_out = self.surrogate_fn(self.V - self.V_th)
-            self.spikes = spike_out.bool()
+        return self.spikes.view(torch.bool)
 
-        self.V = torch.where(self.spikes, torch.tensor(self.V_reset, device=self.device), self.V)
+    def forward_sequence(self, I_seq: torch.Tensor, external_modulation: torch.Tensor = None):
+        """
+        Simulate all time steps of an input sequence in one call.
+        Equivalent to calling forward for every time step, but the whole sequence runs in one compiled graph
+        (with compile_step) or, for inference, in a single Triton/Numba kernel that keeps the states in registers.
 
-        self.adaptation_current = self.adaptation_current * self.adaptation_decay + self.spike_increase * self.spikes.float()
-        self.synaptic_efficiency = (
-                self.synaptic_efficiency * (1 - self.depression_rate * self.spikes.float()) +
-                self.recovery_rate * (1 - self.synaptic_efficiency)
-        )
+        :param I_seq: Tensor of input currents with shape (timesteps, batch_size, num_neurons).
+        :param external_modulation: Tensor of external neuromodulatory signals, either per time step with shape
+                                    (timesteps, batch_size, num_neurons) or broadcastable shape,
+                                    or one signal used for every time step as in forward.
+        :return: Tuple of spikes (binary) and membrane potentials, both of shape (timesteps, batch_size, num_neurons).
+        """
+        if I_seq.shape[1:] != self.V.shape:
+            self.resize(I_seq.shape[1])
 
-        if self.use_adaptive_threshold:
-            if isinstance(self.V_th, nn.Parameter):
-                self.V_th.data = torch.clamp(self.V_th.data, self.min_threshold, self.max_threshold)
+        neuromod_seq = None
+        if external_modulation is not None:
+            if external_modulation.ndim == 3:
+                neuromod_seq = torch.stack([self._transform_modulation(m) for m in external_modulation])
             else:
-                self.V_th = torch.clamp(self.V_th, self.min_threshold, self.max_threshold)
+                self.neuromodulator = self._transform_modulation(external_modulation)
+
+        spike_adaptation = self.dynamic_spike_probability.adaptation if self.allow_dynamic_spike_probability else None
+        I_seq = I_seq.to(self.dtype)
+        beta = self._get_beta()
+        fused_kernel = self._get_fused_kernel(I_seq, sequence=True)
+        if fused_kernel is not None:
+            spike_seq, voltage_seq = fused_kernel(
+                I_seq, neuromod_seq, self._pack_states(), self.V_th, self.spikes, spike_adaptation,
+                beta, self.eta, **self._step_constants
+            )
+        else:
+            sequence_fn = self._get_step_fn(I_seq, sequence=True)
+            (spike_seq, voltage_seq, self.V, self.spikes, self.adaptation_current, self.synaptic_efficiency,
+             spike_adaptation, self.threshold_adaptation) = sequence_fn(
+                I_seq, neuromod_seq, self.V, self.V_th, self.spikes, self.adaptation_current,
+                self.synaptic_efficiency, self.neuromodulator, spike_adaptation, self.threshold_adaptation,
+                self._noise, self._uniform, beta, self.eta
+            )
+            if self.allow_dynamic_spike_probability:
+                self.dynamic_spike_probability.adaptation = spike_adaptation
 
-        return self.spikes
+        if neuromod_seq is not None:
+            self.neuromodulator = neuromod_seq[-1]
+        return spike_seq.view(torch.bool), voltage_seq
@@ -1,38 +1,75 @@
-from typing import Optional
+from typing import Optional, Union
 
 import torch
 
+SURROGATE_IDS = {"heaviside": 0, "fast_sigmoid": 1, "gaussian": 2, "arctan": 3}
+
+
+def surrogate_gradient(x: torch.Tensor, sg_id: int, alpha: float) -> torch.Tensor:
+    """
+    Surrogate derivative of the spike function, dispatched on an id from SURROGATE_IDS.
+    Fully typed and free of Python objects, so it can be scripted and is specialized on sg_id by torch.compile.
+    """
+    if sg_id == 0:
+        return 0.5 * (torch.sign(x) + 1)
+    elif sg_id == 1:
+        return 1 / ((1 + alpha * x.abs()) ** 2)
+    elif sg_id == 2:
+        return torch.exp(-(x ** 2) / (2 * (alpha ** 2)))
+    elif sg_id == 3:
+        return 1 / (1 + (alpha * x) ** 2)
+    raise ValueError(f"Unknown surrogate gradient id: {sg_id}")
+
+
+def surrogate_id(surrogate_gradient_function: Union[str, int]) -> int:
+    """
+    Resolve a surrogate gradient name or id to its id in SURROGATE_IDS.
+    """
+    if isinstance(surrogate_gradient_function, str):
+        name = surrogate_gradient_function.lower()
+        if name not in SURROGATE_IDS:
+            raise ValueError(f"Unknown surrogate gradient function: {surrogate_gradient_function}")
+        return SURROGATE_IDS[name]
+    if surrogate_gradient_function not in SURROGATE_IDS.values():
+        raise ValueError(f"Unknown surrogate gradient id: {surrogate_gradient_function}")
+    return surrogate_gradient_function
+
 
 class SpikeFunction(torch.autograd.Function):
     @staticmethod
-    def forward(ctx, input, surrogate_gradient_function: str = "heaviside", alpha: float = 1.0):
-        ctx.surrogate_gradient_function = surrogate_gradient_function.lower()
+    def forward(ctx, input, surrogate_gradient_function: Union[str, int] = "heaviside", alpha: float = 1.0):
+        ctx.sg_id = surrogate_id(surrogate_gradient_function)
         ctx.alpha = alpha
-        output = (input >= 0).float()
+        output = (input >= 0).to(input.dtype)
         ctx.save_for_backward(input)
         return output
 
     @staticmethod
     def backward(ctx, grad_output):
         (input,) = ctx.saved_tensors
-        surrogate_gradient_function = ctx.surrogate_gradient_function
-        func = getattr(SpikeFunction, surrogate_gradient_function)
-        alpha = ctx.alpha
-        grad_input = func(input, alpha) * grad_output
+        grad_input = (surrogate_gradient(input, ctx.sg_id, ctx.alpha) * grad_output).to(input.dtype)
         return grad_input, None, None
 
     @staticmethod
-    def heaviside(x):
-        return 0.5 * (torch.sign(x) + 1)
+    def heaviside(x, alpha: float = 1.0):
+        return surrogate_gradient(x, SURROGATE_IDS["heaviside"], alpha)
 
     @staticmethod
     def fast_sigmoid(x, alpha: float = 1.0):
-        return 1 / ((1 + alpha * x.abs()) ** 2)
+        return surrogate_gradient(x, SURROGATE_IDS["fast_sigmoid"], alpha)
 
     @staticmethod
     def gaussian(x, alpha: float = 1.0):
-        return torch.exp(-(x ** 2) / (2 * (alpha ** 2)))
+        return surrogate_gradient(x, SURROGATE_IDS["gaussian"], alpha)
 
     @staticmethod
     def arctan(x, alpha: float = 1.0):
-        return 1 / (1 + (alpha * x) ** 2)
+        return surrogate_gradient(x, SURROGATE_IDS["arctan"], alpha)
+
+
+def apply_surrogate(x: torch.Tensor, sg_id: int, alpha: float) -> torch.Tensor:
+    """
+    Spike function with the surrogate gradient given by its id in SURROGATE_IDS.
+    Plain function of constants, so torch.compile can trace through it into the step graph.
+    """
+    return SpikeFunction.apply(x, sg_id, alpha)
@@ -75,9 +75,20 @@ def visualize_neuron_modes():
             **params
         ).to(device)
 
+        threshold_np = None
         with torch.no_grad():
             if "Neuromod" in name:
                 spikes, voltages = lif(input_current, external_modulation=external_mod)
+            elif params.get('use_adaptive_threshold', False):
+                # Step by step, to record the effective threshold that moves with every spike
+                lif.lif_group.resize(batch_size)
+                spikes, voltages, thresholds = [], [], []
+                for t in range(timesteps):
+                    spikes.append(lif.lif_group(input_current[t]))
+                    voltages.append(lif.lif_group.V.clone())
+                    thresholds.append(lif.lif_group.threshold.clone())
+                spikes, voltages = torch.stack(spikes), torch.stack(voltages)
+                threshold_np = torch.stack(thresholds).cpu().numpy().squeeze()
             else:
                 spikes, voltages = lif(input_current)
 
@@ -94,8 +105,7 @@ def visualize_neuron_modes():
         plt.scatter(spike_times, np.ones_like(spike_times)*1.5,
                     marker='x', color='tab:red', label='Spikes')
 
-        if params.get('use_adaptive_threshold', False):
-            threshold_np = lif.lif_group.V_th.cpu().numpy().squeeze()
+        if threshold_np is not None:
             plt.plot(threshold_np, label='Threshold', color='tab:green', linestyle='--')
 
         plt.ylabel('Voltage/Input')
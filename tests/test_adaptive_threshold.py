@@ -0,0 +1,42 @@
+import pytest
+import torch
+
+from lif.lif_neuron_group import LIFNeuronGroup
+
+
+def _make_group(**kwargs):
+    return LIFNeuronGroup(num_neurons=1, V_th=1.0, eta=0.1, stochastic=False, learnable_threshold=False, **kwargs)
+
+
+def test_threshold_rises_after_spike_and_decays_back():
+    group = _make_group()
+    assert group.threshold.tolist() == [[1.0]]
+
+    # Large enough to cross the threshold within one step
+    assert group(torch.full((1, 1), 100.0)).item()
+    assert group.threshold.item() == pytest.approx(1.1)
+
+    previous = group.threshold.item()
+    for _ in range(50):
+        assert not group(torch.zeros(1, 1)).item()
+        current = group.threshold.item()
+        assert current < previous
+        previous = current
+    assert previous == pytest.approx(1.0, abs=1e-2)
+    # The base threshold itself is never touched
+    assert group.V_th.tolist() == [1.0]
+
+
+def test_threshold_is_clamped():
+    group = _make_group(max_threshold=1.05)
+    group(torch.full((1, 1), 100.0))
+
+    assert group.threshold.item() == pytest.approx(1.05)
+
+
+def test_threshold_without_adaptation_is_base_threshold():
+    group = _make_group(use_adaptive_threshold=False)
+    group(torch.full((2, 1), 100.0))
+
+    assert group.threshold.shape == (2, 1)
+    assert group.threshold.tolist() == [[1.0], [1.0]]
@@ -0,0 +1,93 @@
+import pytest
+import torch
+
+from layers.torch_layers import LIFLayer
+from lif.lif_neuron_group import LIFNeuronGroup
+
+TIMESTEPS = 20
+BATCH_SIZE = 4
+NUM_NEURONS = 37
+
+
+@pytest.mark.parametrize("use_adaptive_threshold", [False, True])
+@pytest.mark.parametrize("modulation", [None, "constant", "per_step"])
+def test_forward_sequence_matches_forward_loop(use_adaptive_threshold, modulation):
+    torch.manual_seed(0)
+    kwargs = dict(num_neurons=NUM_NEURONS, stochastic=False, use_adaptive_threshold=use_adaptive_threshold)
+    sequence_group = LIFNeuronGroup(**kwargs)
+    loop_group = LIFNeuronGroup(**kwargs)
+    I_seq = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS) * 2
+    if modulation == "constant":
+        external_modulation = torch.randn(BATCH_SIZE, NUM_NEURONS)
+        step_modulation = [external_modulation] * TIMESTEPS
+    elif modulation == "per_step":
+        external_modulation = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+        step_modulation = list(external_modulation)
+    else:
+        external_modulation = None
+        step_modulation = [None] * TIMESTEPS
+
+    spike_seq, voltage_seq = sequence_group.forward_sequence(I_seq, external_modulation)
+
+    assert spike_seq.shape == voltage_seq.shape == (TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+    for t in range(TIMESTEPS):
+        spikes = loop_group(I_seq[t], step_modulation[t])
+        assert torch.equal(spike_seq[t], spikes)
+        torch.testing.assert_close(voltage_seq[t].detach(), loop_group.V.detach())
+    torch.testing.assert_close(sequence_group.V.detach(), loop_group.V.detach())
+    torch.testing.assert_close(sequence_group.neuromodulator.detach(), loop_group.neuromodulator.detach())
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.bfloat16])
+def test_lif_layer_output_shape_and_dtype(dtype):
+    torch.manual_seed(0)
+    layer = LIFLayer(num_neurons=NUM_NEURONS, dtype=dtype)
+    I_seq = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+
+    spikes, voltages = layer(I_seq)
+
+    assert spikes.shape == (TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+    assert voltages.shape == (TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+    assert spikes.dtype == torch.bool
+    assert voltages.dtype == dtype
+
+
+def test_lif_layer_recycles_buffers_for_the_same_batch_size(monkeypatch):
+    torch.manual_seed(0)
+    layer = LIFLayer(num_neurons=NUM_NEURONS)
+    optimizer = torch.optim.SGD(layer.parameters(), lr=0.1)
+    I_seq = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS)
+    layer(I_seq)
+
+    group = layer.lif_group
+    V_th = group.V_th
+    V_ptr = group.V.data_ptr()
+    state_ptr = group._state.data_ptr()
+    forward_sequence = group.forward_sequence
+    seen = {}
+
+    def record_states(*args, **kwargs):
+        # The states as resize() left them, right before the sequence runs
+        seen["V_ptr"] = group.V.data_ptr()
+        seen["V_zero"] = not group.V.any().item()
+        return forward_sequence(*args, **kwargs)
+
+    monkeypatch.setattr(group, "forward_sequence", record_states)
+    layer(I_seq)
+
+    assert seen == {"V_ptr": V_ptr, "V_zero": True}
+    assert group._state.data_ptr() == state_ptr
+    # The learnable threshold is still the parameter the optimizer updates
+    assert group.V_th is V_th
+    assert any(param is V_th for param in optimizer.param_groups[0]["params"])
+
+
+def test_initialize_states_follows_the_batch_size():
+    group = LIFNeuronGroup(num_neurons=NUM_NEURONS)
+
+    group.initialize_states(BATCH_SIZE)
+
+    assert group.batch_size == BATCH_SIZE
+    for state in (group.V, group.spikes, group.adaptation_current, group.synaptic_efficiency,
+                  group.neuromodulator, group.threshold_adaptation, group.dynamic_spike_probability.adaptation):
+        assert state.shape == (BATCH_SIZE, NUM_NEURONS)
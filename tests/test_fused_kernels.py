@@ -0,0 +1,151 @@
+import math
+
+import pytest
+import torch
+
+from lif.lif_neuron_group import LIFNeuronGroup
+from lif.kernels.lif_step_numba import NUMBA_AVAILABLE
+from lif.kernels.triton_lif_step import TRITON_AVAILABLE
+
+TIMESTEPS = 20
+BATCH_SIZE = 4
+NUM_NEURONS = 37
+# Large enough for the sample moments and spike rates to land within ~1% of their expected values
+STOCHASTIC_BATCH_SIZE = 2000
+STOCHASTIC_NUM_NEURONS = 50
+
+BACKENDS = [
+    pytest.param("cpu", marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")),
+    pytest.param("cuda", marks=pytest.mark.skipif(not (TRITON_AVAILABLE and torch.cuda.is_available()),
+                                                  reason="triton or CUDA is not available")),
+]
+
+
+def _make_pair(device, **kwargs):
+    """
+    Two identical groups, deterministic unless overridden: the first runs the PyTorch step (training with
+    autograd), the second the fused kernel (eval mode, used under no_grad).
+    """
+    kwargs = {"num_neurons": NUM_NEURONS, "stochastic": False, "device": device, **kwargs}
+    reference = LIFNeuronGroup(**kwargs).to(device)
+    fused = LIFNeuronGroup(**kwargs).to(device).eval()
+    return reference, fused
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+@pytest.mark.parametrize("use_adaptive_threshold", [False, True])
+def test_fused_step_matches_pytorch_step(device, use_adaptive_threshold):
+    torch.manual_seed(0)
+    reference, fused = _make_pair(device, use_adaptive_threshold=use_adaptive_threshold)
+    I = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS, device=device) * 2
+
+    with torch.no_grad():
+        assert fused._get_fused_kernel(I[0]) is not None
+    for t in range(TIMESTEPS):
+        reference_spikes = reference(I[t])
+        with torch.no_grad():
+            fused_spikes = fused(I[t])
+        assert torch.equal(reference_spikes, fused_spikes)
+        torch.testing.assert_close(fused.V, reference.V.detach())
+        torch.testing.assert_close(fused.adaptation_current, reference.adaptation_current.detach())
+        torch.testing.assert_close(fused.synaptic_efficiency, reference.synaptic_efficiency.detach())
+        if use_adaptive_threshold:
+            torch.testing.assert_close(fused.threshold_adaptation, reference.threshold_adaptation.detach())
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+@pytest.mark.parametrize("use_adaptive_threshold", [False, True])
+def test_fused_sequence_matches_pytorch_sequence(device, use_adaptive_threshold):
+    torch.manual_seed(0)
+    reference, fused = _make_pair(device, use_adaptive_threshold=use_adaptive_threshold)
+    I_seq = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS, device=device) * 2
+
+    reference_spikes, reference_voltages = reference.forward_sequence(I_seq)
+    with torch.no_grad():
+        assert fused._get_fused_kernel(I_seq, sequence=True) is not None
+        fused_spikes, fused_voltages = fused.forward_sequence(I_seq)
+
+    assert torch.equal(reference_spikes, fused_spikes)
+    torch.testing.assert_close(fused_voltages, reference_voltages.detach())
+    torch.testing.assert_close(fused.V, reference.V.detach())
+    if use_adaptive_threshold:
+        torch.testing.assert_close(fused.threshold_adaptation, reference.threshold_adaptation.detach())
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+def test_spike_adaptation_follows_the_batch_size(device):
+    group = LIFNeuronGroup(num_neurons=NUM_NEURONS, device=device).to(device).eval()
+    I = torch.randn(BATCH_SIZE, NUM_NEURONS, device=device)
+
+    group.initialize_states(BATCH_SIZE)
+    assert group.dynamic_spike_probability.adaptation.shape == (BATCH_SIZE, NUM_NEURONS)
+
+    # A buffer the kernels cannot index per element has to fall back to the broadcasting PyTorch step
+    group.dynamic_spike_probability.adaptation = torch.zeros(1, NUM_NEURONS, device=device)
+    with torch.no_grad():
+        assert group._get_fused_kernel(I) is None
+
+
+def _run_noise_step(device):
+    """
+    One fused step from rest with a threshold out of reach, so V is (1 - beta) * neuromodulator plus noise.
+    """
+    group = LIFNeuronGroup(
+        num_neurons=STOCHASTIC_NUM_NEURONS, V_th=20.0, noise_std=0.5, stochastic=True,
+        use_adaptive_threshold=False, allow_dynamic_spike_probability=False, device=device
+    ).to(device).eval()
+    I = torch.zeros(STOCHASTIC_BATCH_SIZE, STOCHASTIC_NUM_NEURONS, device=device)
+    with torch.no_grad():
+        assert group._get_fused_kernel(I) is not None
+        spikes = group(I)
+    assert not spikes.any()
+    return group.V.clone()
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+def test_fused_noise_moments(device):
+    torch.manual_seed(0)
+    V = _run_noise_step(device)
+
+    expected_mean = 1 - math.exp(-1.0 / 20.0)
+    assert V.mean().item() == pytest.approx(expected_mean, abs=1e-2)
+    assert V.std().item() == pytest.approx(0.5, rel=2e-2)
+    # Neighbouring neurons draw from different counters, so their noise must not be correlated
+    assert torch.corrcoef(torch.stack([V[:, 0], V[:, 1]]))[0, 1].abs().item() < 0.1
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+def test_fused_noise_follows_torch_seed(device):
+    torch.manual_seed(0)
+    first = _run_noise_step(device)
+    torch.manual_seed(0)
+    second = _run_noise_step(device)
+    third = _run_noise_step(device)
+
+    assert torch.equal(first, second)
+    assert not torch.equal(second, third)
+
+
+@pytest.mark.parametrize("device", BACKENDS)
+@pytest.mark.parametrize("allow_dynamic_spike_probability", [False, True])
+def test_fused_spike_rate_matches_pytorch_step(device, allow_dynamic_spike_probability):
+    torch.manual_seed(0)
+    reference, fused = _make_pair(
+        device, num_neurons=STOCHASTIC_NUM_NEURONS, stochastic=True,
+        allow_dynamic_spike_probability=allow_dynamic_spike_probability
+    )
+    I_seq = torch.ones(10, STOCHASTIC_BATCH_SIZE, STOCHASTIC_NUM_NEURONS, device=device)
+
+    reference_spikes, reference_voltages = reference.forward_sequence(I_seq)
+    with torch.no_grad():
+        assert fused._get_fused_kernel(I_seq, sequence=True) is not None
+        fused_spikes, fused_voltages = fused.forward_sequence(I_seq)
+
+    # Different random streams, so only the per-step statistics can match
+    torch.testing.assert_close(fused_spikes.float().mean((1, 2)), reference_spikes.float().mean((1, 2)),
+                               atol=1.5e-2, rtol=0)
+    torch.testing.assert_close(fused_voltages.mean((1, 2)), reference_voltages.detach().mean((1, 2)),
+                               atol=1.5e-2, rtol=0)
+    if allow_dynamic_spike_probability:
+        torch.testing.assert_close(fused.dynamic_spike_probability.adaptation.mean(),
+                                   reference.dynamic_spike_probability.adaptation.mean(), atol=1e-2, rtol=2e-2)
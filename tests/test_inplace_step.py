@@ -0,0 +1,54 @@
+import pytest
+import torch
+
+from lif.lif_neuron_group import LIFNeuronGroup
+
+TIMESTEPS = 20
+BATCH_SIZE = 4
+NUM_NEURONS = 37
+
+CONFIGS = {
+    "deterministic": dict(stochastic=False),
+    "deterministic_fixed_threshold": dict(stochastic=False, use_adaptive_threshold=False),
+    "stochastic": dict(stochastic=True),
+    "learnable_tau_bfloat16": dict(stochastic=False, learnable_tau=True, dtype=torch.bfloat16),
+}
+
+
+@pytest.fixture
+def no_fused_kernels(monkeypatch):
+    # Inference would otherwise go to Numba/Triton whenever they are installed
+    monkeypatch.setattr("lif.lif_neuron_group.NUMBA_AVAILABLE", False)
+    monkeypatch.setattr("lif.lif_neuron_group.TRITON_AVAILABLE", False)
+
+
+@pytest.mark.parametrize("config", list(CONFIGS))
+def test_inplace_step_matches_training_step(no_fused_kernels, config):
+    torch.manual_seed(0)
+    kwargs = dict(num_neurons=NUM_NEURONS, **CONFIGS[config])
+    reference = LIFNeuronGroup(**kwargs)
+    inplace = LIFNeuronGroup(**kwargs).eval()
+    I = torch.randn(TIMESTEPS, BATCH_SIZE, NUM_NEURONS) * 2
+
+    with torch.no_grad():
+        assert inplace._get_step_fn(I[0]) is inplace._inplace_step_fn
+    for t in range(TIMESTEPS):
+        # Same seed for both groups, so the stochastic config draws the same noise and uniforms
+        torch.manual_seed(t)
+        reference_spikes = reference(I[t])
+        torch.manual_seed(t)
+        with torch.no_grad():
+            spikes = inplace(I[t])
+        assert torch.equal(spikes, reference_spikes)
+        assert torch.equal(inplace.V, reference.V.detach())
+        # Updated in-place, so V is still the view into the state blob
+        assert inplace.V.data_ptr() == inplace._state[0].data_ptr()
+
+
+def test_eval_with_grad_enabled_uses_out_of_place_step(no_fused_kernels):
+    group = LIFNeuronGroup(num_neurons=NUM_NEURONS).eval()
+    I = torch.randn(BATCH_SIZE, NUM_NEURONS)
+
+    assert group._get_step_fn(I) is group._step_fn
+    with torch.no_grad():
+        assert group._get_step_fn(I) is group._inplace_step_fn
@@ -0,0 +1,28 @@
+import pytest
+import torch
+
+from lif.lif_neuron_group import get_surrogate_fn
+from lif.sg.spike_function import SURROGATE_IDS, SpikeFunction, surrogate_gradient
+
+
+@pytest.mark.parametrize("name", list(SURROGATE_IDS))
+def test_get_surrogate_fn_spikes_and_backpropagates(name):
+    x = torch.tensor([-1.0, 0.5], requires_grad=True)
+    spikes = get_surrogate_fn(name, 1.0)(x)
+    spikes.sum().backward()
+
+    assert spikes.tolist() == [0.0, 1.0]
+    torch.testing.assert_close(x.grad, surrogate_gradient(x.detach(), SURROGATE_IDS[name], 1.0))
+
+
+def test_unknown_surrogate_name_raises():
+    with pytest.raises(ValueError):
+        get_surrogate_fn("sigmoid", 1.0)
+
+
+@pytest.mark.parametrize("sg_id", [-1, len(SURROGATE_IDS)])
+def test_unknown_surrogate_id_raises(sg_id):
+    with pytest.raises(ValueError):
+        surrogate_gradient(torch.zeros(2), sg_id, 1.0)
+    with pytest.raises(ValueError):
+        SpikeFunction.apply(torch.zeros(2), sg_id, 1.0)
@@ -0,0 +1,34 @@
+import math
+
+import pytest
+import torch
+
+from lif.lif_neuron_group import LIFNeuronGroup, pack_spikes, unpack_spikes
+
+
+@pytest.mark.parametrize("num_neurons", [1, 5, 13, 16, 37])
+def test_pack_unpack_round_trip(num_neurons):
+    torch.manual_seed(0)
+    spikes = torch.rand(3, 2, num_neurons) < 0.5
+
+    packed = pack_spikes(spikes)
+    assert packed.dtype == torch.uint8
+    assert packed.shape == (3, 2, math.ceil(num_neurons / 8))
+    assert torch.equal(unpack_spikes(packed, num_neurons), spikes)
+
+
+def test_pack_bit_layout():
+    spikes = torch.zeros(1, 13, dtype=torch.bool)
+    spikes[0, 0] = True
+    spikes[0, 9] = True
+
+    # Neuron i is stored in bit i % 8 of byte i // 8
+    assert pack_spikes(spikes).tolist() == [[1, 2]]
+
+
+def test_spikes_packed_matches_forward_output():
+    torch.manual_seed(0)
+    group = LIFNeuronGroup(num_neurons=13, stochastic=False)
+    spikes = group(torch.randn(4, 13) * 3)
+
+    assert torch.equal(unpack_spikes(group.spikes_packed, 13), spikes)
@@ -0,0 +1,58 @@
+import pytest
+import torch
+
+from lif.lif_neuron_group import _make_lif_step
+
+NUM_SAMPLES = 200_000
+DELTAS = torch.tensor([-3.0, -1.0, -0.25, 0.0, 0.5, 2.0])
+V_TH = 1.0
+
+
+def _make_step(allow_dynamic_spike_probability, base_alpha=2.0, spike_adapt_decay=0.9):
+    return _make_lif_step(
+        V_reset=0.0, noise_std=0.0, stochastic=True, use_adaptive_threshold=False, min_threshold=0.5,
+        max_threshold=2.0, allow_dynamic_spike_probability=allow_dynamic_spike_probability, base_alpha=base_alpha,
+        spike_adapt_decay=spike_adapt_decay, adaptation_decay=0.9, spike_increase=0.5, depression_rate=0.1,
+        recovery_rate=0.05, sg_id=0, alpha=1.0
+    )
+
+
+def _fire(step, spike_adaptation=None, spikes=None):
+    """
+    One step with beta = 0, unit synaptic efficiency and no neuromodulation or adaptation current,
+    so V - threshold equals DELTAS in every row.
+    """
+    shape = (NUM_SAMPLES, len(DELTAS))
+    I = (V_TH + DELTAS).expand(shape).contiguous()
+    return step(
+        I, torch.zeros(shape), torch.full((len(DELTAS),), V_TH),
+        torch.zeros(shape, dtype=torch.uint8) if spikes is None else spikes,
+        torch.zeros(shape), torch.ones(shape), torch.zeros(shape), spike_adaptation, None,
+        torch.empty(shape), torch.empty(shape), 0.0, 0.0
+    )
+
+
+def test_spike_rate_is_sigmoid_of_delta():
+    torch.manual_seed(0)
+    spikes = _fire(_make_step(allow_dynamic_spike_probability=False))[1]
+
+    rate = spikes.float().mean(0)
+    # Binomial standard error is at most 0.5 / sqrt(NUM_SAMPLES) ~ 0.0011
+    torch.testing.assert_close(rate, torch.sigmoid(DELTAS), atol=6e-3, rtol=0)
+
+
+@pytest.mark.parametrize("previous_adaptation, previous_spike", [(0.0, 0), (0.0, 1), (3.0, 1)])
+def test_dynamic_spike_rate_uses_adapted_slope(previous_adaptation, previous_spike):
+    torch.manual_seed(0)
+    base_alpha, spike_adapt_decay = 2.0, 0.9
+    shape = (NUM_SAMPLES, len(DELTAS))
+    spike_adaptation = torch.full(shape, previous_adaptation)
+    spikes = torch.full(shape, previous_spike, dtype=torch.uint8)
+
+    result = _fire(_make_step(True, base_alpha, spike_adapt_decay), spike_adaptation, spikes)
+    new_spikes, new_adaptation = result[1], result[4]
+
+    adaptation = previous_adaptation * spike_adapt_decay + previous_spike
+    torch.testing.assert_close(new_adaptation, torch.full(shape, adaptation))
+    slope = base_alpha / (1 + adaptation)
+    torch.testing.assert_close(new_spikes.float().mean(0), torch.sigmoid(slope * DELTAS), atol=6e-3, rtol=0)